@@ -1,7 +1,13 @@
 import json
+import re
+import threading
+from sys import intern
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
-import requests
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlencode
+import orjson
+import urllib3
 
 from tracer.config.settings import (
     ETHERSCAN_API_KEY,
@@ -11,14 +17,19 @@ from tracer.config.settings import (
     ETHERSCAN_TIMEOUT_SEC,
     ETHERSCAN_MAX_RETRIES,
     ETHERSCAN_PAGE_SIZE,
+    ETHERSCAN_MAX_WORKERS,
     ETHERSCAN_CHECKPOINT_FILE,
+    ETHERSCAN_CONTRACT_CACHE_FILE,
 )
 
-from tracer.adapters.chain.rate_limiter import SimpleRateLimiter, backoff_sleep
+from tracer.adapters.chain.rate_limiter import TokenBucket, backoff_sleep, parse_retry_after
 from tracer.core.errors import DataSourceError, RateLimitError
 from tracer.ports.chain_data_port import ChainDataPort
 from tracer.core.dto import RawErc20Transfer, RawEthTransfer, TokenMeta
 
+# eth_getCode returns hex bytecode; anything else is an API error message
+_HEX_CODE_RE = re.compile(r"0x[0-9a-fA-F]*")
+
 
 class EtherscanChainAdapter(ChainDataPort):
 
@@ -30,47 +41,63 @@ class EtherscanChainAdapter(ChainDataPort):
         self._max_retries = ETHERSCAN_MAX_RETRIES
         self._page_size = ETHERSCAN_PAGE_SIZE
 
-        self._rl = SimpleRateLimiter(ETHERSCAN_REQUESTS_PER_SEC)
-        self._session = requests.Session()
+        # apikey/chainid never change: encode them once, per call only the
+        # request-specific params are appended
+        static_qs: Dict[str, Any] = {"chainid": self._chainid}
+        if self._api_key:
+            static_qs["apikey"] = self._api_key
+        self._url_prefix = f"{self._base_url}?{urlencode(static_qs)}&"
+
+        self._rl = TokenBucket(rate=ETHERSCAN_REQUESTS_PER_SEC, capacity=ETHERSCAN_REQUESTS_PER_SEC)
+        # one thread-safe keep-alive pool shared by the caller and prefetch threads
+        self._http = urllib3.PoolManager(
+            maxsize=ETHERSCAN_MAX_WORKERS,
+            timeout=urllib3.Timeout(connect=self._timeout, read=self._timeout),
+            retries=False,
+        )
+        # background fetch of page N+1 while page N is being consumed
+        self._prefetch = ThreadPoolExecutor(max_workers=2, thread_name_prefix="etherscan-prefetch")
 
-        self._is_contract_cache: Dict[str, bool] = {}
+        self._contract_cache_path = Path(ETHERSCAN_CONTRACT_CACHE_FILE)
+        self._contract_cache_lock = threading.Lock()
+        self._is_contract_cache: Dict[str, bool] = self._load_contract_cache()
+        self._contract_cache_dirty = False
         self._token_meta_cache: Dict[str, TokenMeta] = {}
         self._checkpoint_path = Path(ETHERSCAN_CHECKPOINT_FILE)
         self._checkpoints: Dict[str, int] = self._load_checkpoints()
+        self._checkpoint_lock = threading.Lock()
 
     # ---------- internal ----------
 
     def _call(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        req = dict(params)
-        req["apikey"] = self._api_key
-        req["chainid"] = str(self._chainid)
+        url = self._url_prefix + urlencode(params)
 
         last_err: Optional[Exception] = None
 
         for attempt in range(self._max_retries):
+            retry_after: Optional[float] = None
             try:
-                self._rl.wait()
-                resp = self._session.get(
-                    self._base_url,
-                    params=req,
-                    timeout=self._timeout,
-                )
-                resp.raise_for_status()
-                data = resp.json()
+                self._rl.acquire()
+                resp = self._http.request("GET", url)
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if resp.status >= 400:
+                    raise DataSourceError(f"Etherscan HTTP {resp.status}")
+                data = orjson.loads(resp.data)
 
                 status = str(data.get("status", "1"))
                 message = str(data.get("message", "OK"))
 
                 if status == "0" and "rate" in message.lower():
                     last_err = RateLimitError(message)
-                    backoff_sleep(attempt)
-                    continue
-
-                return data
+                else:
+                    return data
 
             except Exception as e:
                 last_err = e
-                backoff_sleep(attempt)
+
+            # no point sleeping after the final attempt
+            if attempt + 1 < self._max_retries:
+                backoff_sleep(attempt, retry_after=retry_after)
 
         raise DataSourceError(f"Etherscan failed after retries: {last_err}")
 
@@ -79,6 +106,39 @@ class EtherscanChainAdapter(ChainDataPort):
         res = data.get("result")
         return res if isinstance(res, list) else []
 
+    def _fetch_page(self, params: Dict[str, Any], page: int) -> list:
+        req = dict(params)
+        req["page"] = page
+        req["offset"] = self._page_size
+        return self._list_result(self._call(req))
+
+    def _iter_pages(self, params: Dict[str, Any], checkpoint_key: str) -> Iterator[list]:
+        """
+        Yields result pages in order. While the caller consumes page N,
+        page N+1 is already being fetched in the background.
+        """
+        page = self._checkpoints.get(checkpoint_key, 0) + 1
+        rows = self._fetch_page(params, page)
+        nxt: Optional[Future] = None
+        try:
+            while rows:
+                nxt = None
+                if len(rows) >= self._page_size:
+                    nxt = self._prefetch.submit(self._fetch_page, params, page + 1)
+
+                yield rows
+
+                self._save_checkpoint(checkpoint_key, page)
+                if nxt is None:
+                    break
+                rows = nxt.result()
+                page += 1
+        finally:
+            # a caller that stops iterating early must not leave its next
+            # page request queued
+            if nxt is not None:
+                nxt.cancel()
+
     def _load_checkpoints(self) -> Dict[str, int]:
         try:
             if not self._checkpoint_path.exists():
@@ -99,14 +159,46 @@ class EtherscanChainAdapter(ChainDataPort):
 
     def _save_checkpoint(self, key: str, page: int) -> None:
         try:
-            self._checkpoints[key] = int(page)
-            self._checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
-            with self._checkpoint_path.open("w", encoding="utf-8") as f:
-                json.dump(self._checkpoints, f, indent=2)
+            # several addresses may be paged concurrently by the tracer
+            with self._checkpoint_lock:
+                self._checkpoints[key] = int(page)
+                self._checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+                with self._checkpoint_path.open("w", encoding="utf-8") as f:
+                    json.dump(self._checkpoints, f, indent=2)
         except Exception:
             # best-effort: checkpointing should not break tracing
             return
 
+    def _load_contract_cache(self) -> Dict[str, bool]:
+        try:
+            if not self._contract_cache_path.exists():
+                return {}
+            with self._contract_cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                return {}
+            # older cache files also hold EOAs: drop them, they get re-checked
+            return {str(k).lower(): True for k, v in data.items() if v is True}
+        except Exception:
+            return {}
+
+    def _save_contract_cache(self) -> None:
+        if not self._contract_cache_dirty:
+            return
+        try:
+            self._contract_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # write-then-rename so an interrupted run never truncates the cache
+            tmp_path = self._contract_cache_path.with_suffix(".tmp")
+            with self._contract_cache_lock:
+                snapshot = {a: True for a, v in self._is_contract_cache.items() if v}
+                with tmp_path.open("w", encoding="utf-8") as f:
+                    json.dump(snapshot, f)
+                tmp_path.replace(self._contract_cache_path)
+                self._contract_cache_dirty = False
+        except Exception:
+            # best-effort: caching should not break tracing
+            return
+
     @staticmethod
     def _checkpoint_key(
         action: str,
@@ -141,38 +233,25 @@ class EtherscanChainAdapter(ChainDataPort):
     ) -> Iterable[RawEthTransfer]:
 
         checkpoint_key = self._checkpoint_key("txlist", address, start_block, end_block)
-        page = self._checkpoints.get(checkpoint_key, 0) + 1
-        while True:
-            data = self._call({
-                "module": "account",
-                "action": "txlist",
-                "address": address,
-                "startblock": start_block,
-                "endblock": end_block,
-                "page": page,
-                "offset": self._page_size,
-                "sort": sort,
-            })
-
-            rows = self._list_result(data)
-            if not rows:
-                break
-
+        params: Dict[str, Any] = {
+            "module": "account",
+            "action": "txlist",
+            "address": address,
+            "startblock": start_block,
+            "endblock": end_block,
+            "sort": sort,
+        }
+        for rows in self._iter_pages(params, checkpoint_key):
             for r in rows:
                 yield RawEthTransfer(
                     tx_hash=r.get("hash", ""),
                     block_number=int(r.get("blockNumber", 0)),
                     timestamp=int(r.get("timeStamp", 0)),
-                    from_address=(r.get("from") or "").lower(),
-                    to_address=(r.get("to") or "").lower(),
+                    from_address=intern((r.get("from") or "").lower()),
+                    to_address=intern((r.get("to") or "").lower()),
                     value_wei=int(r.get("value", 0)),
                 )
 
-            self._save_checkpoint(checkpoint_key, page)
-            if len(rows) < self._page_size:
-                break
-            page += 1
-
     def iter_erc20_transfers(
         self,
         address: str,
@@ -189,61 +268,47 @@ class EtherscanChainAdapter(ChainDataPort):
             end_block,
             token_address=token_address,
         )
-        page = self._checkpoints.get(checkpoint_key, 0) + 1
-        while True:
-            params: Dict[str, Any] = {
-                "module": "account",
-                "action": "tokentx",
-                "address": address,
-                "startblock": start_block,
-                "endblock": end_block,
-                "page": page,
-                "offset": self._page_size,
-                "sort": sort,
-            }
-            if token_address:
-                params["contractaddress"] = token_address
-
-            data = self._call(params)
-            rows = self._list_result(data)
-            if not rows:
-                break
-
+        params: Dict[str, Any] = {
+            "module": "account",
+            "action": "tokentx",
+            "address": address,
+            "startblock": start_block,
+            "endblock": end_block,
+            "sort": sort,
+        }
+        if token_address:
+            params["contractaddress"] = token_address
+
+        for rows in self._iter_pages(params, checkpoint_key):
             for r in rows:
-                ta = (r.get("contractAddress") or "").lower()
-                sym = r.get("tokenSymbol")
-                dec = r.get("tokenDecimal")
-
-                if ta not in self._token_meta_cache:
-                    self._token_meta_cache[ta] = TokenMeta(
+                # hot wallets/tokens repeat on every row: share one string object
+                ta = intern((r.get("contractAddress") or "").lower())
+
+                # symbol/decimals are per token: only parse them on a cache miss
+                meta = self._token_meta_cache.get(ta)
+                if meta is None:
+                    dec_raw = r.get("tokenDecimal")
+                    meta = TokenMeta(
                         token_address=ta,
-                        symbol=sym,
-                        decimals=int(dec) if dec and str(dec).isdigit() else None,
+                        symbol=r.get("tokenSymbol"),
+                        decimals=int(dec_raw) if dec_raw and str(dec_raw).isdigit() else None,
                         name=None,
                     )
+                    self._token_meta_cache[ta] = meta
 
                 yield RawErc20Transfer(
                     tx_hash=r.get("hash", ""),
                     block_number=int(r.get("blockNumber", 0)),
                     timestamp=int(r.get("timeStamp", 0)),
-                    from_address=(r.get("from") or "").lower(),
-                    to_address=(r.get("to") or "").lower(),
+                    from_address=intern((r.get("from") or "").lower()),
+                    to_address=intern((r.get("to") or "").lower()),
                     token_address=ta,
                     value_raw=int(r.get("value", 0)),
-                    token_symbol=sym,
-                    token_decimals=int(dec) if dec and str(dec).isdigit() else None,
+                    token_symbol=meta.symbol,
+                    token_decimals=meta.decimals,
                 )
 
-            self._save_checkpoint(checkpoint_key, page)
-            if len(rows) < self._page_size:
-                break
-            page += 1
-
-    def is_contract(self, address: str) -> bool:
-        addr = address.lower()
-        if addr in self._is_contract_cache:
-            return self._is_contract_cache[addr]
-
+    def _fetch_is_contract(self, addr: str) -> bool:
         data = self._call({
             "module": "proxy",
             "action": "eth_getCode",
@@ -251,14 +316,60 @@ class EtherscanChainAdapter(ChainDataPort):
             "tag": "latest",
         })
 
-        code = data.get("result") or "0x"
+        code = data.get("result")
+        # errors come back as prose in "result" (e.g. "Max rate limit
+        # reached"): never mistake them for bytecode, and never cache them
+        if not isinstance(code, str) or not _HEX_CODE_RE.fullmatch(code):
+            raise DataSourceError(f"Invalid eth_getCode result for {addr}: {code!r}")
         is_c = code not in ("0x", "0x0")
-        self._is_contract_cache[addr] = is_c
+        # only contracts are persisted: an EOA today may get code later
+        # (CREATE2 counterfactual addresses), so it is remembered for this
+        # run only
+        with self._contract_cache_lock:
+            self._is_contract_cache[addr] = is_c
+            self._contract_cache_dirty = self._contract_cache_dirty or is_c
         return is_c
 
+    def is_contract(self, address: str) -> bool:
+        addr = address.lower()
+        if addr in self._is_contract_cache:
+            return self._is_contract_cache[addr]
+
+        # persisted by the next is_contract_many batch or by close()
+        return self._fetch_is_contract(addr)
+
+    def is_contract_many(self, addresses: Iterable[str]) -> Dict[str, bool]:
+        addrs = list(dict.fromkeys(a.lower() for a in addresses))
+        out: Dict[str, bool] = {}
+        missing: List[str] = []
+        for a in addrs:
+            cached = self._is_contract_cache.get(a)
+            if cached is None:
+                missing.append(a)
+            else:
+                out[a] = cached
+        if not missing:
+            return out
+
+        with ThreadPoolExecutor(max_workers=ETHERSCAN_MAX_WORKERS) as pool:
+            futures = {a: pool.submit(self._fetch_is_contract, a) for a in missing}
+            for a, fut in futures.items():
+                try:
+                    out[a] = fut.result()
+                except Exception:
+                    continue
+
+        self._save_contract_cache()
+        return out
+
     def get_token_meta(self, token_address: str) -> TokenMeta:
         ta = token_address.lower()
         return self._token_meta_cache.get(
             ta,
             TokenMeta(token_address=ta, symbol=None, decimals=None, name=None),
         )
+
+    def close(self) -> None:
+        self._save_contract_cache()
+        # drop queued page prefetches and wait for the one in flight, if any
+        self._prefetch.shutdown(wait=True, cancel_futures=True)
@@ -1,24 +1,74 @@
 import time
 import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
 
+# never sleep longer than this on a server-provided Retry-After
+RETRY_AFTER_MAX_SEC = 60.0
 
-class SimpleRateLimiter:
-    def __init__(self, requests_per_sec: float) -> None:
-        if requests_per_sec <= 0:
-            raise ValueError("requests_per_sec must be > 0")
-        self._min_interval = 1.0 / requests_per_sec
-        self._last_ts = 0.0
 
-    def wait(self) -> None:
-        now = time.time()
-        elapsed = now - self._last_ts
-        sleep_for = self._min_interval - elapsed
+class TokenBucket:
+    """
+    Thread-safe token bucket: bursts of up to `capacity` requests, refilled
+    at `rate` tokens/sec. Concurrent callers share the rate instead of each
+    waiting a full interval.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            # reserve a token even if the bucket is empty; the deficit is
+            # what this caller has to wait out (outside the lock)
+            self._tokens -= 1
+            sleep_for = -self._tokens / self._rate if self._tokens < 0 else 0.0
         if sleep_for > 0:
             time.sleep(sleep_for)
-        self._last_ts = time.time()
 
 
-def backoff_sleep(attempt: int, base: float = 0.5, cap: float = 8.0) -> None:
-    t = min(cap, base * (2 ** attempt))
-    t *= 0.7 + random.random() * 0.6
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP-date).
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_sleep(
+    attempt: int,
+    base: float = 0.5,
+    cap: float = 8.0,
+    retry_after: Optional[float] = None,
+) -> None:
+    if retry_after is not None:
+        # the server said how long to wait: honour it (bounded) + small jitter
+        t = min(retry_after, RETRY_AFTER_MAX_SEC) + random.random() * base
+    else:
+        t = min(cap, base * (2 ** attempt))
+        t *= 0.7 + random.random() * 0.6
     time.sleep(t)
@@ -1,6 +1,46 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from sys import intern
 from tracer.ports.chain_data_port import ChainDataPort
 from tracer.core.dto import RawEthTransfer, RawErc20Transfer, TokenMeta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+
+# address -> (block column, rows), both in (block, timestamp) order
+_AddressIndex = Dict[str, Tuple[List[int], list]]
+_NO_ROWS: Tuple[List[int], list] = ([], [])
+
+
+def _chain_order(t) -> Tuple[int, int]:
+    return (t.block_number, t.timestamp)
+
+
+def _lower_eth(t: RawEthTransfer) -> RawEthTransfer:
+    return replace(
+        t,
+        from_address=intern(t.from_address.lower()),
+        to_address=intern(t.to_address.lower()),
+    )
+
+
+def _lower_erc20(t: RawErc20Transfer) -> RawErc20Transfer:
+    return replace(
+        t,
+        from_address=intern(t.from_address.lower()),
+        to_address=intern(t.to_address.lower()),
+        token_address=intern(t.token_address.lower()),
+    )
+
+
+def _index_by_address(transfers: list) -> _AddressIndex:
+    index: _AddressIndex = {}
+    for t in sorted(transfers, key=_chain_order):
+        ends = (t.from_address,) if t.from_address == t.to_address else (t.from_address, t.to_address)
+        for a in ends:
+            blocks, rows = index.setdefault(a, ([], []))
+            blocks.append(t.block_number)
+            rows.append(t)
+    return index
+
 
 class StaticChainAdapter(ChainDataPort):
     def __init__(self, 
@@ -10,12 +50,19 @@ class StaticChainAdapter(ChainDataPort):
                  contracts:Optional[Dict[str,bool]] = None,
                  ts_to_block: Optional[Dict[int, int]] = None,
                  ):
-        self._eth = eth_transfers or []
-        self._erc20 = erc20_transfers or []
+        # addresses are lowercased once here (like EtherscanChainAdapter does
+        # at parse time) and indexed per address, so a query is a dict lookup
+        # plus two bisects on that address's block column
+        self._eth = _index_by_address([_lower_eth(t) for t in eth_transfers or []])
+        self._erc20 = _index_by_address([_lower_erc20(t) for t in erc20_transfers or []])
         self._meta = token_meta or {}
         self._contract = {k.lower():v for k,v in (contracts or {}).items()}
         self._ts_to_block = ts_to_block or {}
     
+    @staticmethod
+    def _window(blocks: List[int], start_block: int, end_block: int) -> Tuple[int, int]:
+        return bisect_left(blocks, start_block), bisect_right(blocks, end_block)
+
     def get_block_number_by_time(self, unix_ts, closest:str = "before"):
         return self._ts_to_block.get(int(unix_ts), 0)
     
@@ -25,31 +72,23 @@ class StaticChainAdapter(ChainDataPort):
     def iter_erc20_transfers(self, address, start_block, end_block, sort = "asc", token_address = None):
         ad = address.lower()
         token =  token_address.lower() if token_address else None
+        blocks, rows = self._erc20.get(ad, _NO_ROWS)
+        lo, hi = self._window(blocks, start_block, end_block)
         items = [
-           t for t in self._erc20
-           if t.block_number >= start_block 
-           and t.block_number <= end_block
-           and (t.from_address.lower() == ad or t.to_address.lower() == ad)
-           and (token is None or t.token_address.lower() == token)
+           t for t in rows[lo:hi]
+           if token is None or t.token_address == token
         ]
         if sort=="desc":
-            items.sort(key=lambda x: (x.block_number,x.timestamp),reverse=True)
-        else:
-            items.sort(key=lambda x: (x.block_number,x.timestamp))
+            items.sort(key=_chain_order,reverse=True)
         return items
     
     def iter_normal_txs(self, address, start_block, end_block, sort = "asc"):
         ad = address.lower()
-        items = [
-            t for t in self._eth
-            if t.block_number >= start_block
-            and t.block_number <= end_block
-            and (t.from_address.lower() == ad or t.to_address.lower() == ad)
-        ]
+        blocks, rows = self._eth.get(ad, _NO_ROWS)
+        lo, hi = self._window(blocks, start_block, end_block)
+        items = rows[lo:hi]
         if sort == "desc":
-            items.sort(key=lambda x: (x.block_number,x.timestamp),reverse=True)
-        else:
-            items.sort(key=lambda x: (x.block_number,x.timestamp))
+            items.sort(key=_chain_order,reverse=True)
         return items
     def is_contract(self, address):
         return bool(self._contract.get(address.lower(), False))
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Optional
 
 from tracer.ports.price_port import PricePort
 from tracer.config import settings
@@ -9,16 +9,13 @@ from tracer.config import settings
 
 class PriceAdapter(PricePort):
 
+    def __init__(self) -> None:
+        # one lookup per transfer: stablecoins pegged at 1, fixed prices win
+        self._token_usd: Dict[str, Decimal] = dict.fromkeys(settings.STABLECOIN_ADDRESSES, Decimal("1"))
+        self._token_usd.update(settings.FIXED_TOKEN_USD)
+
     def get_eth_usd_price(self, timestamp: int) -> Decimal:
         return settings.ETH_USD_FALLBACK
 
     def get_token_usd_price(self, token_address: str, timestamp: int) -> Optional[Decimal]:
-        addr = token_address.lower()
-
-        if addr in settings.FIXED_TOKEN_USD:
-            return settings.FIXED_TOKEN_USD[addr]
-
-        if addr in settings.STABLECOIN_ADDRESSES:
-            return Decimal("1")
-
-        return None
+        return self._token_usd.get(token_address.lower())
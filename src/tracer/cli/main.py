@@ -2,19 +2,32 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import os
 import sys
 import time
 from decimal import Decimal
+from functools import lru_cache
+from typing import Optional
 
+from tracer.config import settings
 from tracer.core.models import TraceConfig
 from tracer.services.tracer_service import TracerService
 from tracer.io.output_writer import write_graph_json, write_summary_md, write_graph_html
 
-from tracer.adapters.chain.etherscan_chain_adapter import EtherscanChainAdapter
 from tracer.adapters.chain.static_chain_adapter import StaticChainAdapter 
 from tracer.adapters.pricing.price_adapter import PriceAdapter
 
+_TTY_FLUSH_SEC = 0.1
+
+
+# fetch events repeat addresses across phases and hops
+@lru_cache(maxsize=4096)
+def _short_addr(addr: str) -> str:
+    if not addr:
+        return ""
+    if len(addr) <= 12:
+        return addr
+    return f"{addr[:6]}...{addr[-4:]}"
+
 
 def build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="tracer", description="Value-flow tracer (ETH + ERC20)")
@@ -28,6 +41,8 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--use-static", action="store_true", help="Use static adapter (dev/testing)")
     p.add_argument("--ignore-unknown-price", action="store_true", help="Skip transfers where USD price cannot be determined",)
     p.add_argument("--enable-contract-check", action="store_true", help="Enable contract checks (slower, uses eth_getCode)",)
+    p.add_argument("--workers", type=int, default=4, help="Concurrent address fetches (1=serial, still rate limited)")
+    p.add_argument("--gzip", action="store_true", help="Write graph.json.gz (gzip) instead of graph.json")
     p.add_argument("--html", action="store_true", help="Write a basic HTML visualization alongside graph.json",)
     return p
 
@@ -37,25 +52,46 @@ def _make_progress_reporter(cfg: TraceConfig):
     last_print = 0.0
     is_tty = sys.stdout.isatty()
 
-    def _short_addr(addr: str) -> str:
-        if not addr:
-            return ""
-        if len(addr) <= 12:
-            return addr
-        return f"{addr[:6]}...{addr[-4:]}"
-
-    def _ts() -> str:
-        return dt.datetime.now().strftime("%H:%M:%S")
-
-    def _print_line(message: str) -> None:
-        if is_tty:
-            sys.stdout.write("\r" + message.ljust(88))
-            sys.stdout.flush()
-        else:
+    # [second, formatted]: events within the same second share one string
+    ts_cache = [-1, ""]
+
+    def _ts(now: float) -> str:
+        sec = int(now)
+        if sec != ts_cache[0]:
+            ts_cache[0] = sec
+            ts_cache[1] = dt.datetime.fromtimestamp(sec).strftime("%H:%M:%S")
+        return ts_cache[1]
+
+    # TTY status lines overwrite each other, so within one flush interval
+    # only the latest is written; the rest never reach the terminal. A
+    # "fetch" line announces a wait of unknown length and is always written,
+    # otherwise the terminal would show a stale line for the whole fetch.
+    pending_line: Optional[str] = None
+    last_flush = 0.0
+
+    def _flush_line(now: float) -> None:
+        nonlocal pending_line, last_flush
+        if pending_line is None:
+            return
+        sys.stdout.write("\r" + pending_line.ljust(88))
+        sys.stdout.flush()
+        pending_line = None
+        last_flush = now
+
+    def _print_line(message: str, force: bool = False) -> None:
+        nonlocal pending_line
+        if not is_tty:
             print(message)
+            return
+        pending_line = message
+        now = time.time()
+        if force or now - last_flush >= _TTY_FLUSH_SEC:
+            _flush_line(now)
 
     def _clear_line() -> None:
+        nonlocal pending_line
         if is_tty:
+            pending_line = None
             sys.stdout.write("\r" + (" " * 88) + "\r")
             sys.stdout.flush()
 
@@ -63,7 +99,7 @@ def _make_progress_reporter(cfg: TraceConfig):
         nonlocal last_print
         now = time.time()
         if event == "start":
-            print(f"[{_ts()}] Tracing {cfg.address} • {cfg.days}d • {cfg.hops} hop(s)")
+            print(f"[{_ts(now)}] Tracing {cfg.address} • {cfg.days}d • {cfg.hops} hop(s)")
             return
         if event == "visit":
             if not is_tty and data["processed"] % 100 != 0:
@@ -83,7 +119,7 @@ def _make_progress_reporter(cfg: TraceConfig):
             phase = data.get("phase", "data").upper()
             addr = _short_addr(str(data.get("address", "")))
             msg = f"Fetching {phase} for {addr}..."
-            _print_line(msg)
+            _print_line(msg, force=True)
             last_print = now
             return
         if event == "fetch_done":
@@ -102,15 +138,15 @@ def _make_progress_reporter(cfg: TraceConfig):
             return
         if event == "done":
             _clear_line()
-            elapsed = time.time() - start_time
+            elapsed = now - start_time
             print(
-                f"[{_ts()}] Done in {elapsed:.1f}s • "
+                f"[{_ts(now)}] Done in {elapsed:.1f}s • "
                 f"{data['nodes']} nodes • {data['edges']} edges"
             )
             return
         if event == "error":
             _clear_line()
-            print(f"[{_ts()}] Error: {data.get('message', 'Unknown error')}", file=sys.stderr)
+            print(f"[{_ts(now)}] Error: {data.get('message', 'Unknown error')}", file=sys.stderr)
 
     return progress
 
@@ -127,6 +163,7 @@ def main() -> int:
         max_total_edges=args.max_total_edges,
         ignore_unknown_price=args.ignore_unknown_price,
         skip_contract_check=not args.enable_contract_check,
+        workers=args.workers,
     )
     progress = _make_progress_reporter(cfg)
 
@@ -136,9 +173,12 @@ def main() -> int:
         adapter_label = "StaticChainAdapter (dev/testing)"
     else:
         # Etherscan key should come from env or settings file
-        if not os.getenv("ETHERSCAN_API_KEY"):
+        if not settings.ETHERSCAN_API_KEY:
             progress("error", {"message": "Missing ETHERSCAN_API_KEY environment variable"})
             return 2
+        # imported here so --use-static / --help do not load the HTTP stack
+        from tracer.adapters.chain.etherscan_chain_adapter import EtherscanChainAdapter
+
         chain = EtherscanChainAdapter()
         adapter_label = "EtherscanChainAdapter"
 
@@ -152,10 +192,12 @@ def main() -> int:
     except Exception as exc:
         progress("error", {"message": f"{exc.__class__.__name__}: {exc}"})
         return 1
+    finally:
+        chain.close()
 
     # Outputs
     print("Writing outputs...")
-    graph_path = write_graph_json(graph, args.out)
+    graph_path = write_graph_json(graph, args.out, compress=args.gzip)
     summary_path = write_summary_md(graph, args.out, seed_address=cfg.address)
     html_path = None
     if args.html:
@@ -1,9 +1,8 @@
 from decimal import Decimal
 import os
-from dotenv import load_dotenv
-load_dotenv()
 # ---- Etherscan ----
-ETHERSCAN_API_KEY = os.environ.get("ETHERSCAN_API_KEY")         
+# ETHERSCAN_API_KEY is read from the environment (and .env) on first access,
+# see __getattr__ at the bottom: importing settings does no file I/O
 ETHERSCAN_CHAIN_ID = 1          # Ethereum mainnet
 ETHERSCAN_BASE_URL = "https://api.etherscan.io/v2/api"
 
@@ -11,7 +10,11 @@ ETHERSCAN_REQUESTS_PER_SEC = 2.0
 ETHERSCAN_TIMEOUT_SEC = 15
 ETHERSCAN_MAX_RETRIES = 5
 ETHERSCAN_PAGE_SIZE = 1000
+ETHERSCAN_MAX_WORKERS = 8       # concurrent in-flight calls (still rate limited)
 ETHERSCAN_CHECKPOINT_FILE = ".cache/etherscan_checkpoints.json"
+# contracts found by eth_getCode survive restarts; EOAs are re-checked every
+# run since code can still be deployed to them later (e.g. CREATE2)
+ETHERSCAN_CONTRACT_CACHE_FILE = ".cache/etherscan_is_contract.json"
 
 # ----- Pricing ------
 
@@ -19,13 +22,33 @@ ETHERSCAN_CHECKPOINT_FILE = ".cache/etherscan_checkpoints.json"
 ETH_USD_FALLBACK = Decimal("3000")
 
 # Stablecoin addresses (optional). Lowercase.
-STABLECOIN_ADDRESSES = {
+STABLECOIN_ADDRESSES = frozenset({
     "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48",  # USDC
     "0xdac17f958d2ee523a2206206994597c13d831ec7",  # USDT 
     "0x6b175474e89094c44da98b954eedeac495271d0f",  # DAI  
-}
+})
 
 # Fixed token prices for demo
 FIXED_TOKEN_USD = {
     "0x2260fac5e5542a773aa44fbcfedf7c193bc2c599":Decimal("93000"),
 }
+
+
+# ----- Environment-backed settings (resolved lazily) -----
+
+_ENV_SETTINGS = {
+    "ETHERSCAN_API_KEY": None,
+}
+
+
+def __getattr__(name: str):
+    if name not in _ENV_SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from dotenv import load_dotenv
+
+    # .env never overrides real env vars; runs once, the values are then
+    # stored as plain module globals and __getattr__ is not hit again
+    load_dotenv()
+    for key, default in _ENV_SETTINGS.items():
+        globals()[key] = os.environ.get(key, default)
+    return globals()[name]
@@ -2,8 +2,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RawEthTransfer:
+    """Addresses are lowercase hex; adapters normalize them when parsing."""
+
     tx_hash: str
     block_number: int
     timestamp: int
@@ -12,8 +14,10 @@ class RawEthTransfer:
     value_wei: int          # ETH value in wei (raw)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RawErc20Transfer:
+    """Addresses (incl. token_address) are lowercase hex; adapters normalize them when parsing."""
+
     tx_hash: str
     block_number: int
     timestamp: int
@@ -25,7 +29,7 @@ class RawErc20Transfer:
     token_decimals: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TokenMeta:
     token_address: str
     symbol: Optional[str]
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional
 
 # Configuration model
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TraceConfig:
     """
     User input / run configuration for tracing.
@@ -25,12 +25,13 @@ class TraceConfig:
     max_total_edges: int = 0          # 0 = unlimited
     ignore_unknown_price: bool = False
     skip_contract_check: bool = True
+    workers: int = 1                  # concurrent address fetches (1 = serial)
 
 
 
 # Graph models
 
-@dataclass
+@dataclass(slots=True)
 class Node:
 
     address: str
@@ -41,7 +42,7 @@ class Node:
     # risk_score: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
 
     from_address: str
@@ -58,7 +59,7 @@ class Edge:
     usd_value: Optional[Decimal]
 
 
-@dataclass
+@dataclass(slots=True)
 class Graph:
 
     nodes: Dict[str, Node] = field(default_factory=dict)
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
-import json
+import gzip
+from collections import defaultdict
 from decimal import Decimal
+from heapq import nlargest
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import Optional
 
 from tracer.core.models import Graph
-from tracer.io.schemas import graph_to_dict
+from tracer.io.schemas import iter_graph_json
 
+DEC_ZERO = Decimal(0)
 
-def write_graph_json(graph: Graph, out_dir: str, filename: str = "graph.json") -> str:
+
+def write_graph_json(
+    graph: Graph,
+    out_dir: str,
+    filename: str = "graph.json",
+    compress: bool = False,
+) -> str:
     p = Path(out_dir)
     p.mkdir(parents=True, exist_ok=True)
 
-    out_path = p / filename
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(graph_to_dict(graph), f, indent=2)
+    # graph.html loads graph.json before graph.json.gz: never leave the other
+    # variant of an earlier run behind in the same folder
+    plain_path = p / filename
+    gz_path = p / f"{filename}.gz"
+
+    if compress:
+        plain_path.unlink(missing_ok=True)
+        # level 1: most of the size win on repetitive hex JSON, little CPU
+        out_path = gz_path
+        with gzip.open(out_path, "wb", compresslevel=1) as f:
+            f.writelines(iter_graph_json(graph))
+        return str(out_path)
+
+    gz_path.unlink(missing_ok=True)
+    out_path = plain_path
+    # streamed one record per line through a 1 MiB buffer
+    with out_path.open("wb", buffering=1 << 20) as f:
+        f.writelines(iter_graph_json(graph))
 
     return str(out_path)
 
@@ -41,31 +66,35 @@ def write_summary_md(
     def sort_key(e):
         return (e.usd_value is not None, e.usd_value or 0)
 
-    top = sorted(graph.edges, key=sort_key, reverse=True)[:15]
-
-    def sum_by_address(edges, key):
-        totals = {}
-        for e in edges:
-            if e.usd_value is None:
-                continue
-            addr = key(e)
-            totals[addr] = totals.get(addr, Decimal("0")) + e.usd_value
-        return totals
-
-    inflow_edges = [e for e in graph.edges if seed and e.to_address == seed]
-    outflow_edges = [e for e in graph.edges if seed and e.from_address == seed]
+    top = nlargest(15, graph.edges, key=sort_key)
 
-    inflow_totals = sum_by_address(inflow_edges, lambda e: e.from_address)
-    outflow_totals = sum_by_address(outflow_edges, lambda e: e.to_address)
+    # one pass over the edges for both directions (a self-transfer counts
+    # as both, like before)
+    inflow_count = 0
+    outflow_count = 0
+    inflow_totals = defaultdict(Decimal)  # Decimal() == 0
+    outflow_totals = defaultdict(Decimal)
+    if seed:
+        flow_fields = attrgetter("usd_value", "from_address", "to_address")
+        for usd, frm, to in map(flow_fields, graph.edges):
+            if to == seed:
+                inflow_count += 1
+                if usd is not None:
+                    inflow_totals[frm] += usd
+            if frm == seed:
+                outflow_count += 1
+                if usd is not None:
+                    outflow_totals[to] += usd
 
     def top_n(totals, n=10):
-        return sorted(totals.items(), key=lambda x: x[1], reverse=True)[:n]
+        # same order as sorted(..., reverse=True)[:n], ties included
+        return nlargest(n, totals.items(), key=itemgetter(1))
 
     top_in = top_n(inflow_totals)
     top_out = top_n(outflow_totals)
 
-    total_in_usd = sum(inflow_totals.values(), Decimal("0"))
-    total_out_usd = sum(outflow_totals.values(), Decimal("0"))
+    total_in_usd = sum(inflow_totals.values(), DEC_ZERO)
+    total_out_usd = sum(outflow_totals.values(), DEC_ZERO)
 
     def fmt_usd(x: Decimal) -> str:
         return f"{x:.2f}"
@@ -76,7 +105,7 @@ def write_summary_md(
     def interpretation() -> str:
         if not seed:
             return "No seed address was provided to the summary writer."
-        if not inflow_edges and not outflow_edges:
+        if not inflow_count and not outflow_count:
             return "No value movements touched the seed address in this window."
         uniq_in = len(inflow_totals)
         uniq_out = len(outflow_totals)
@@ -141,7 +170,7 @@ def write_summary_md(
             )
 
     with out_path.open("w", encoding="utf-8") as f:
-        f.writelines(lines)
+        f.write("".join(lines))
 
     return str(out_path)
 
@@ -152,7 +181,13 @@ def write_graph_html(graph: Graph, out_dir: str, filename: str = "index.html") -
 
     out_path = p / filename
 
-    html = """<!doctype html>
+    # static page: it loads graph.json at view time, nothing is templated
+    out_path.write_bytes(_GRAPH_HTML_BYTES)
+
+    return str(out_path)
+
+
+_GRAPH_HTML = """<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
@@ -251,8 +286,17 @@ def write_graph_html(graph: Graph, out_dir: str, filename: str = "index.html") -
       return addr.length > 14 ? addr.slice(0, 10) + "..." : addr;
     };
 
-    fetch("./graph.json")
-      .then((r) => r.json())
+    // graph.json, or graph.json.gz when written with --gzip
+    const loadGraph = () =>
+      fetch("./graph.json").then((r) => {
+        if (r.ok) return r.json();
+        return fetch("./graph.json.gz").then((gz) => {
+          if (!gz.ok) throw new Error("graph.json not found");
+          return new Response(gz.body.pipeThrough(new DecompressionStream("gzip"))).json();
+        });
+      });
+
+    loadGraph()
       .then((data) => {
         if (!window.vis || !window.vis.Network) {
           document.getElementById("stats").textContent = "Graph library failed to load.";
@@ -304,8 +348,4 @@ def write_graph_html(graph: Graph, out_dir: str, filename: str = "index.html") -
 </body>
 </html>
 """
-
-    with out_path.open("w", encoding="utf-8") as f:
-        f.write(html)
-
-    return str(out_path)
+_GRAPH_HTML_BYTES = _GRAPH_HTML.encode("utf-8")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 
-from tracer.core.models import Graph
+import orjson
+
+from tracer.core.models import Edge, Graph, Node
 
 
 def _dec_to_str(x: Decimal) -> str:
@@ -11,27 +13,47 @@ def _dec_to_str(x: Decimal) -> str:
     return format(x, "f")
 
 
+def node_to_dict(n: Node) -> Dict[str, Any]:
+    return {
+        "address": n.address,
+        "is_contract": n.is_contract,
+    }
+
+
+def edge_to_dict(e: Edge) -> Dict[str, Any]:
+    return {
+        "from": e.from_address,
+        "to": e.to_address,
+        "tx_hash": e.tx_hash,
+        "timestamp": e.timestamp,
+        "asset_type": e.asset_type,
+        "token_address": e.token_address,
+        "symbol": e.symbol,
+        "amount": _dec_to_str(e.amount),
+        "usd_value": _dec_to_str(e.usd_value) if e.usd_value is not None else None,
+    }
+
+
 def graph_to_dict(g: Graph) -> Dict[str, Any]:
     return {
-        "nodes": [
-            {
-                "address": n.address,
-                "is_contract": n.is_contract,
-            }
-            for n in g.nodes.values()
-        ],
-        "edges": [
-            {
-                "from": e.from_address,
-                "to": e.to_address,
-                "tx_hash": e.tx_hash,
-                "timestamp": e.timestamp,
-                "asset_type": e.asset_type,
-                "token_address": e.token_address,
-                "symbol": e.symbol,
-                "amount": _dec_to_str(e.amount),
-                "usd_value": _dec_to_str(e.usd_value) if e.usd_value is not None else None,
-            }
-            for e in g.edges
-        ],
+        "nodes": [node_to_dict(n) for n in g.nodes.values()],
+        "edges": [edge_to_dict(e) for e in g.edges],
     }
+
+
+def iter_graph_json(g: Graph) -> Iterator[bytes]:
+    """
+    Same document as graph_to_dict, encoded one node/edge per line as it
+    goes, so the whole graph is never materialized as dicts at once.
+    """
+    yield b'{"nodes":['
+    sep = b"\n"
+    for n in g.nodes.values():
+        yield sep + orjson.dumps(node_to_dict(n))
+        sep = b",\n"
+    yield b'\n],"edges":['
+    sep = b"\n"
+    for e in g.edges:
+        yield sep + orjson.dumps(edge_to_dict(e))
+        sep = b",\n"
+    yield b"\n]}\n"
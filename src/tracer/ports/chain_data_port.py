@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Optional
 from tracer.core.dto import RawEthTransfer, RawErc20Transfer, TokenMeta
 
 class ChainDataPort(ABC):
@@ -45,8 +45,31 @@ class ChainDataPort(ABC):
     @abstractmethod
     def is_contract(self, address: str) -> bool:
         raise NotImplementedError
+
+    def is_contract_many(self, addresses: Iterable[str]) -> Dict[str, bool]:
+        """
+        Bulk is_contract keyed by lowercased address. Addresses whose check
+        failed are left out. Adapters backed by a remote API should override
+        this to overlap the round trips.
+        """
+        out: Dict[str, bool] = {}
+        for a in addresses:
+            try:
+                out[a.lower()] = bool(self.is_contract(a))
+            except Exception:
+                continue
+        return out
     
     # --- check token metadata ---
     @abstractmethod
     def get_token_meta(self, token_address: str) -> TokenMeta:
         raise NotImplementedError
+
+    # --- lifecycle ---
+
+    def close(self) -> None:
+        """
+        Persist caches and release background resources. Called once the
+        caller is done tracing; adapters without either need not override.
+        """
+        return None
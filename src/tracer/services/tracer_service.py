@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import threading
 import time
+from sys import intern
 from collections import deque
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
 from decimal import Decimal
+from itertools import islice
 from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 
 from tracer.ports.chain_data_port import ChainDataPort
@@ -13,11 +16,30 @@ from tracer.core.models import Graph, Node, Edge, TraceConfig
 
 WEI_PER_ETH = Decimal("1000000000000000000")
 
+# transfers within the same hour share one PricePort lookup, made at the
+# start of the hour so the price never depends on which transfer came first
+PRICE_BUCKET_SEC = 3600
+_MISSING = object()
+_NEG_ONE = Decimal(-1)
 
-@dataclass(frozen=True)
-class _hopItem:
-    address: str
-    depth: int
+# new nodes are tagged through chain.is_contract_many in batches of at most
+# this many, flushed at every BFS level boundary and at the end
+CONTRACT_CHECK_BATCH = 256
+
+# 10**decimals divisors; real tokens use 0..36 decimals
+_POW10 = tuple(Decimal(10) ** Decimal(d) for d in range(37))
+
+
+def _pow10(decimals: int) -> Decimal:
+    if 0 <= decimals < len(_POW10):
+        return _POW10[decimals]
+    return Decimal(10) ** Decimal(decimals)
+
+
+def _canon_addr(addr: str) -> str:
+    # DTO addresses are already lowercase (see core/dto.py): islower() is a
+    # read-only scan, so the lower() copy is only paid for stray mixed case
+    return intern(addr if addr.islower() else addr.lower())
 
 
 class TracerService:
@@ -32,6 +54,8 @@ class TracerService:
     def __init__(self, chain: ChainDataPort, price: PricePort) -> None:
         self.chain = chain
         self.price = price
+        self._eth_price_cache: Dict[int, Decimal] = {}
+        self._token_price_cache: Dict[Tuple[str, int], Optional[Decimal]] = {}
 
     def trace(
         self,
@@ -45,12 +69,22 @@ class TracerService:
             now_ts = int(now_ts_raw) or int(time.time())
         start_ts = now_ts - int(cfg.days) * 24 * 3600
         processed = 0
+        ignore_unknown_price = bool(getattr(cfg, "ignore_unknown_price", False))
+        workers = max(1, int(getattr(cfg, "workers", 1) or 1))
+        # converted once per run, not once per visited address
+        min_usd = Decimal(str(cfg.min_usd))
+        hops = int(cfg.hops)
+        per_addr_limit = int(getattr(cfg, "max_edges_per_address", 0) or 0)
+        max_total = int(getattr(cfg, "max_total_edges", 0) or 0)
+        # fetch workers report progress too; the reporter assumes one writer
+        emit_lock = threading.Lock()
 
         def _emit(event: str, data: Dict[str, object]) -> None:
             if on_progress is None:
                 return
             try:
-                on_progress(event, data)
+                with emit_lock:
+                    on_progress(event, data)
             except Exception:
                 # Progress is best-effort; avoid breaking tracing on UI issues.
                 return
@@ -72,117 +106,182 @@ class TracerService:
         end_block = self.chain.get_block_number_by_time(now_ts, closest="before")
 
         graph = Graph(nodes={}, edges=[])
+        nodes = graph.nodes
 
-        # Hops
-        q: Deque[_hopItem] = deque([_hopItem(cfg.address.lower(), 0)])
-        seen_addr_depth: Set[Tuple[str, int]] = set()
+        # Hops: queue entries are (address, depth). BFS reaches every address
+        # at its shallowest depth first and its edges do not depend on the
+        # depth, so an address is queued (and visited) at most once. Only
+        # depths up to hops are ever queued; negative hops trace nothing.
+        seed = _canon_addr(cfg.address)
+        q: Deque[Tuple[str, int]] = deque([(seed, 0)] if hops >= 0 else [])
+        seen_addr: Set[str] = {seed}
 
         # limits
         total_edges_added = 0
-        contract_stats = {"checked": 0, "errors": 0}
         seen_edge_keys: Set[Tuple[str, str, str, str, Optional[str]]] = set()
+        contract_stats = {"checked": 0, "errors": 0}
+        check_contracts = not bool(getattr(cfg, "skip_contract_check", True))
+        pending_checks: Optional[List[str]] = [] if check_contracts else None
+        level = 0
 
-        while q:
-            item = q.popleft()
-            addr = item.address.lower()
-            depth = item.depth
-            processed += 1
-
-            if depth > int(cfg.hops):
-                continue
-
-            key = (addr, depth)
-            if key in seen_addr_depth:
-                continue
-            seen_addr_depth.add(key)
-
-            # ensure node
-            self._ensure_node(
-                graph,
-                addr,
-                on_progress=on_progress,
-                stats=contract_stats,
-                skip_contract_check=bool(getattr(cfg, "skip_contract_check", True)),
-            )
-
-            # collect edges for this address
-            new_edges: List[Edge] = []
+        def _flush_contract_checks() -> None:
+            if not pending_checks:
+                return
+            batch = list(pending_checks)
+            pending_checks.clear()
+            try:
+                results = self.chain.is_contract_many(batch)
+            except Exception:
+                results = {}
+            for a in batch:
+                # best-effort: unchecked addresses stay tagged as non-contracts
+                is_c = results.get(a)
+                if is_c is None:
+                    contract_stats["errors"] += 1
+                else:
+                    nodes[a].is_contract = bool(is_c)
+            contract_stats["checked"] += len(batch)
+            _emit("contract_progress", dict(contract_stats))
+
+        # set once the BFS loop is left: prefetches that are still queued or
+        # running stop paging and report nothing, and are drained before
+        # "done" is emitted
+        stop = threading.Event()
+
+        def _fetch_eth(addr: str, depth: int) -> List[Edge]:
+            if stop.is_set():
+                return []
             _emit("fetch", {"phase": "eth", "address": addr, "depth": depth})
-            eth_edges = self._eth_edges_for(addr, start_block, end_block)
-            _emit("fetch_done", {"phase": "eth", "address": addr, "count": len(eth_edges)})
-            new_edges.extend(eth_edges)
-
+            eth_edges = self._eth_edges_for(addr, start_block, end_block, min_usd=min_usd, stop=stop)
+            if not stop.is_set():
+                _emit("fetch_done", {"phase": "eth", "address": addr, "count": len(eth_edges)})
+            return eth_edges
+
+        def _fetch_erc20(addr: str, depth: int) -> List[Edge]:
+            if stop.is_set():
+                return []
             _emit("fetch", {"phase": "erc20", "address": addr, "depth": depth})
             erc20_edges = self._erc20_edges_for(
                 addr,
                 start_block,
                 end_block,
-                ignore_unknown_price=bool(getattr(cfg, "ignore_unknown_price", False)),
+                ignore_unknown_price=ignore_unknown_price,
+                min_usd=min_usd,
+                stop=stop,
             )
-            _emit("fetch_done", {"phase": "erc20", "address": addr, "count": len(erc20_edges)})
-            new_edges.extend(erc20_edges)
-
-            # apply min_usd filter
-            new_edges = self._apply_min_usd(new_edges, Decimal(str(cfg.min_usd)))
-
-            # dedupe edges (by tx_hash + from + to + asset + token)
-            new_edges = self._dedupe_edges(new_edges)
-
-            # prioritize by usd_value desc (unknowns last)
-            new_edges.sort(key=self._edge_sort_key, reverse=True)
+            if not stop.is_set():
+                _emit("fetch_done", {"phase": "erc20", "address": addr, "count": len(erc20_edges)})
+            return erc20_edges
+
+        # Fetches are I/O bound and independent per address and per phase:
+        # with workers > 1 the ETH and ERC-20 histories of the next queue
+        # entries are fetched ahead while the current one is merged. The
+        # graph itself is only touched here, in queue order, so the result
+        # matches a serial run.
+        pool: Optional[ThreadPoolExecutor] = None
+        if workers > 1:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tracer-fetch")
+        pending: Dict[str, Tuple[Future, Future]] = {}
+
+        def _submit(addr: str, depth: int) -> Tuple[Future, Future]:
+            return (pool.submit(_fetch_eth, addr, depth), pool.submit(_fetch_erc20, addr, depth))
+
+        def _prefetch() -> None:
+            # near the end of the edge budget only fetch as many addresses
+            # ahead as could still add an edge; none once it is spent
+            limit = workers
+            if max_total > 0:
+                limit = min(limit, max_total - total_edges_added)
+            for a, d in islice(q, workers * 4):
+                if len(pending) >= limit:
+                    return
+                if a in pending:
+                    continue
+                pending[a] = _submit(a, d)
 
-            # limit edges per address per hop (optional config)
-            per_addr_limit = int(getattr(cfg, "max_edges_per_address", 0) or 0)
-            if per_addr_limit > 0:
-                new_edges = new_edges[:per_addr_limit]
+        try:
+            while q:
+                # canonical: seed and neighbors come from _canon_addr
+                addr, depth = q.popleft()
+                processed += 1
 
-            # limit total edges (optional config)
-            max_total = int(getattr(cfg, "max_total_edges", 0) or 0)
-            if max_total > 0:
-                remaining = max_total - total_edges_added
-                if remaining <= 0:
+                # edge budget spent: stop before fetching another address
+                if max_total > 0 and total_edges_added >= max_total:
                     break
-                new_edges = new_edges[:remaining]
 
-            # add edges + nodes
-            for e in new_edges:
-                edge_key = (e.tx_hash, e.from_address, e.to_address, e.asset_type, e.token_address)
-                if edge_key in seen_edge_keys:
-                    continue
-                seen_edge_keys.add(edge_key)
-                graph.edges.append(e)
-                total_edges_added += 1
-                self._ensure_node(
-                    graph,
-                    e.from_address,
-                    on_progress=on_progress,
-                    stats=contract_stats,
-                    skip_contract_check=bool(getattr(cfg, "skip_contract_check", True)),
-                )
-                self._ensure_node(
-                    graph,
-                    e.to_address,
-                    on_progress=on_progress,
-                    stats=contract_stats,
-                    skip_contract_check=bool(getattr(cfg, "skip_contract_check", True)),
+                if depth != level or (pending_checks and len(pending_checks) >= CONTRACT_CHECK_BATCH):
+                    level = depth
+                    _flush_contract_checks()
+
+                # ensure node
+                self._ensure_node(graph, addr, pending_checks)
+
+                # collect edges for this address
+                new_edges: List[Edge]
+                if pool is None:
+                    new_edges = _fetch_eth(addr, depth) + _fetch_erc20(addr, depth)
+                else:
+                    eth_fut, erc20_fut = pending.pop(addr, None) or _submit(addr, depth)
+                    new_edges = eth_fut.result() + erc20_fut.result()
+
+                # dedupe (by tx_hash + from + to + asset + token); min_usd is
+                # already applied by the edge builders
+                new_edges = self._dedupe_edges(new_edges)
+
+                # prioritize by usd_value desc (unknowns last)
+                new_edges.sort(key=self._edge_sort_key, reverse=True)
+
+                # limit edges per address per hop (optional config)
+                if per_addr_limit > 0:
+                    new_edges = new_edges[:per_addr_limit]
+
+                # limit total edges (optional config)
+                if max_total > 0:
+                    new_edges = new_edges[: max_total - total_edges_added]
+
+                # add edges + nodes
+                for e in new_edges:
+                    edge_key = (e.tx_hash, e.from_address, e.to_address, e.asset_type, e.token_address)
+                    if edge_key in seen_edge_keys:
+                        continue
+                    seen_edge_keys.add(edge_key)
+                    graph.edges.append(e)
+                    total_edges_added += 1
+                    # most edge ends are known after the first hops: test
+                    # membership inline and only call out for new nodes
+                    for a in (e.from_address, e.to_address):
+                        if a not in nodes:
+                            self._ensure_node(graph, a, pending_checks)
+
+                # enqueue neighbors for next hop, highest-value edges first
+                if depth < hops:
+                    for e in new_edges:
+                        for n in (e.from_address, e.to_address):
+                            if n not in seen_addr:
+                                seen_addr.add(n)
+                                q.append((n, depth + 1))
+
+                # fetch ahead only once this address's edges count against
+                # the budget
+                if pool is not None:
+                    _prefetch()
+
+                _emit(
+                    "visit",
+                    {
+                        "address": addr,
+                        "depth": depth,
+                        "queue": len(q),
+                        "processed": processed,
+                        "edges": total_edges_added,
+                    },
                 )
+        finally:
+            stop.set()
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
 
-            # enqueue neighbors for next hop
-            if depth < int(cfg.hops):
-                neighbors = self._neighbor_addresses(addr, new_edges)
-                for n in neighbors:
-                    q.append(_hopItem(n, depth + 1))
-
-            _emit(
-                "visit",
-                {
-                    "address": addr,
-                    "depth": depth,
-                    "queue": len(q),
-                    "processed": processed,
-                    "edges": total_edges_added,
-                },
-            )
+        _flush_contract_checks()
 
         _emit(
             "done",
@@ -200,23 +299,34 @@ class TracerService:
     # Edge builders
     # -------------------------
 
-    def _eth_edges_for(self, address: str, start_block: int, end_block: int) -> List[Edge]:
+    def _eth_edges_for(
+        self,
+        address: str,
+        start_block: int,
+        end_block: int,
+        min_usd: Decimal = Decimal(0),
+        stop: Optional[threading.Event] = None,
+    ) -> List[Edge]:
         edges: List[Edge] = []
-        
+        check_usd = min_usd > 0
 
         for tx in self.chain.iter_normal_txs(address, start_block, end_block, sort="asc"):
+            if stop is not None and stop.is_set():
+                break
             # ETH transfer means value > 0
             if tx.value_wei <= 0:
                 continue
            
-            eth_usd = self.price.get_eth_usd_price(tx.timestamp)
+            eth_usd = self._eth_usd_price(tx.timestamp)
             amount_eth = (Decimal(tx.value_wei) / WEI_PER_ETH)
             usd_value = amount_eth * eth_usd
+            if check_usd and usd_value < min_usd:
+                continue
 
             edges.append(
                 Edge(
-                    from_address=tx.from_address.lower(),
-                    to_address=tx.to_address.lower(),
+                    from_address=_canon_addr(tx.from_address),
+                    to_address=_canon_addr(tx.to_address),
                     tx_hash=tx.tx_hash,
                     timestamp=tx.timestamp,
                     asset_type="ETH",
@@ -235,31 +345,41 @@ class TracerService:
         start_block: int,
         end_block: int,
         ignore_unknown_price: bool = False,
+        min_usd: Decimal = Decimal(0),
+        stop: Optional[threading.Event] = None,
     ) -> List[Edge]:
         edges: List[Edge] = []
+        check_usd = min_usd > 0
 
         for tx in self.chain.iter_erc20_transfers(address, start_block, end_block, sort="asc"):
+            if stop is not None and stop.is_set():
+                break
             decimals = tx.token_decimals
             symbol = tx.token_symbol
+            token = _canon_addr(tx.token_address)
+
+            # price first: skipped transfers never pay for the Decimal amount
+            token_price = self._token_usd_price(token, tx.timestamp)
+            if ignore_unknown_price and token_price is None:
+                continue
 
             amount = Decimal(tx.value_raw)
             if decimals is not None:
                 # token amount normalization
-                amount = amount / (Decimal(10) ** Decimal(decimals))
-
-            token_price = self.price.get_token_usd_price(tx.token_address, tx.timestamp)
-            if ignore_unknown_price and token_price is None:
-                continue
+                amount = amount / _pow10(decimals)
             usd_value = (amount * token_price) if token_price is not None else None
+            # unknown price -> keep (but will rank lower)
+            if check_usd and usd_value is not None and usd_value < min_usd:
+                continue
 
             edges.append(
                 Edge(
-                    from_address=tx.from_address.lower(),
-                    to_address=tx.to_address.lower(),
+                    from_address=_canon_addr(tx.from_address),
+                    to_address=_canon_addr(tx.to_address),
                     tx_hash=tx.tx_hash,
                     timestamp=tx.timestamp,
                     asset_type="ERC20",
-                    token_address=tx.token_address.lower(),
+                    token_address=token,
                     symbol=symbol,
                     amount=amount,
                     usd_value=usd_value,
@@ -272,50 +392,39 @@ class TracerService:
     # Helpers
     # -------------------------
 
+    def _eth_usd_price(self, timestamp: int) -> Decimal:
+        bucket = timestamp // PRICE_BUCKET_SEC
+        px = self._eth_price_cache.get(bucket)
+        if px is None:
+            px = self.price.get_eth_usd_price(bucket * PRICE_BUCKET_SEC)
+            self._eth_price_cache[bucket] = px
+        return px
+
+    def _token_usd_price(self, token_address: str, timestamp: int) -> Optional[Decimal]:
+        # unknown prices (None) are cached too, hence the sentinel
+        bucket = timestamp // PRICE_BUCKET_SEC
+        key = (token_address, bucket)
+        px = self._token_price_cache.get(key, _MISSING)
+        if px is _MISSING:
+            px = self.price.get_token_usd_price(token_address, bucket * PRICE_BUCKET_SEC)
+            self._token_price_cache[key] = px
+        return px
+
     def _ensure_node(
         self,
         graph: Graph,
         address: str,
-        on_progress: Optional[Callable[[str, Dict[str, object]], None]] = None,
-        stats: Optional[Dict[str, int]] = None,
-        skip_contract_check: bool = True,
+        pending_checks: Optional[List[str]] = None,
     ) -> None:
-        addr = address.lower()
-        if addr in graph.nodes:
+        # callers pass canonical addresses (seed, queue entries, edge ends)
+        if address in graph.nodes:
             return
 
-        # best-effort contract tagging (nice for investigators)
-        if skip_contract_check:
-            is_contract = False
-        else:
-            try:
-                is_contract = bool(self.chain.is_contract(addr))
-            except Exception:
-                if stats is not None:
-                    stats["errors"] += 1
-                is_contract = False
-            if stats is not None:
-                stats["checked"] += 1
-                if on_progress is not None and stats["checked"] % 25 == 0:
-                    on_progress(
-                        "contract_progress",
-                        {"checked": stats["checked"], "errors": stats["errors"]},
-                    )
-
-        graph.nodes[addr] = Node(address=addr, is_contract=is_contract)
-
-    def _apply_min_usd(self, edges: List[Edge], min_usd: Decimal) -> List[Edge]:
-        if min_usd <= 0:
-            return edges
-
-        kept: List[Edge] = []
-        for e in edges:
-            # unknown price -> keep (but will rank lower)
-            if e.usd_value is None:
-                kept.append(e)
-            elif e.usd_value >= min_usd:
-                kept.append(e)
-        return kept
+        # best-effort contract tagging (nice for investigators): new nodes
+        # start as non-contracts and are tagged when the batch is flushed
+        graph.nodes[address] = Node(address=address, is_contract=False)
+        if pending_checks is not None:
+            pending_checks.append(address)
 
     def _dedupe_edges(self, edges: List[Edge]) -> List[Edge]:
         seen: Set[Tuple[str, str, str, str, Optional[str]]] = set()
@@ -328,17 +437,9 @@ class TracerService:
             out.append(e)
         return out
 
-    def _neighbor_addresses(self, focus: str, edges: List[Edge]) -> List[str]:
-        s: Set[str] = set()
-        for e in edges:
-            s.add(e.from_address)
-            s.add(e.to_address)
-        s.discard(focus.lower())
-        return sorted(s)
-
     @staticmethod
     def _edge_sort_key(e: Edge) -> Decimal:
-        # unknown usd_value goes last
-        if e.usd_value is None:
-            return Decimal("-1")
-        return Decimal(e.usd_value)
+        # unknown usd_value goes last; known values are already Decimal, so
+        # they are used as-is instead of being copied per edge
+        usd = e.usd_value
+        return _NEG_ONE if usd is None else usd
@@ -0,0 +1,153 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import tracer.adapters.chain.etherscan_chain_adapter as etherscan_module
+from tracer.adapters.chain.etherscan_chain_adapter import EtherscanChainAdapter
+from tracer.core.errors import DataSourceError
+
+
+class _Response:
+    def __init__(self, status=200, data=None, retry_after=None) -> None:
+        self.status = status
+        self.data = json.dumps(data or {}).encode()
+        self.headers = {"Retry-After": retry_after} if retry_after else {}
+
+
+class EtherscanChainAdapterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_path = Path(tmp.name) / "is_contract.json"
+        patcher = mock.patch.multiple(
+            etherscan_module,
+            ETHERSCAN_CONTRACT_CACHE_FILE=str(self.cache_path),
+            ETHERSCAN_CHECKPOINT_FILE=str(Path(tmp.name) / "checkpoints.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _make_adapter(self, get_code=None):
+        """Adapter whose HTTP layer is replaced by get_code(address) -> JSON."""
+        adapter = EtherscanChainAdapter()
+        self.addCleanup(adapter.close)
+        calls = []
+
+        def fake_call(params):
+            calls.append(params)
+            if get_code is None:
+                raise AssertionError("unexpected Etherscan call")
+            return get_code(params["address"])
+
+        adapter._call = fake_call
+        return adapter, calls
+
+    def _saved_cache(self):
+        with self.cache_path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_contract_cache_persists_across_instances(self) -> None:
+        codes = {"0xc0de": {"status": "1", "result": "0x6080604052"}, "0xe0a0": {"result": "0x"}}
+        adapter, _ = self._make_adapter(lambda addr: codes[addr])
+
+        result = adapter.is_contract_many(["0xC0DE", "0xe0a0"])
+
+        self.assertEqual(result, {"0xc0de": True, "0xe0a0": False})
+        self.assertEqual(self._saved_cache(), {"0xc0de": True})
+        self.assertFalse(adapter.is_contract("0xe0a0"))
+
+        reloaded, _ = self._make_adapter()
+        self.assertTrue(reloaded.is_contract("0xc0de"))
+
+    def test_eoas_are_rechecked_on_the_next_run(self) -> None:
+        self.cache_path.write_text(json.dumps({"0xc0de": True, "0xe0a0": False}), encoding="utf-8")
+        adapter, calls = self._make_adapter(lambda addr: {"result": "0x6080"})
+
+        self.assertEqual(adapter.is_contract_many(["0xc0de", "0xe0a0"]), {"0xc0de": True, "0xe0a0": True})
+        self.assertEqual([c["address"] for c in calls], ["0xe0a0"])
+        self.assertEqual(self._saved_cache(), {"0xc0de": True, "0xe0a0": True})
+
+    def test_error_results_are_not_cached(self) -> None:
+        responses = {
+            "0xdead": {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"},
+            "0xbeef": {"status": "1"},
+        }
+        adapter, _ = self._make_adapter(lambda addr: responses[addr])
+
+        with self.assertRaises(DataSourceError):
+            adapter.is_contract("0xdead")
+        with self.assertRaises(DataSourceError):
+            adapter.is_contract("0xbeef")
+        self.assertEqual(adapter.is_contract_many(["0xdead", "0xbeef"]), {})
+
+        adapter.close()
+        self.assertFalse(self.cache_path.exists())
+
+    def test_single_lookups_are_saved_on_close(self) -> None:
+        adapter, calls = self._make_adapter(lambda addr: {"result": "0x60"})
+
+        self.assertTrue(adapter.is_contract("0xc0de"))
+        self.assertTrue(adapter.is_contract("0xc0de"))
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(self.cache_path.exists())
+
+        adapter.close()
+        self.assertEqual(self._saved_cache(), {"0xc0de": True})
+
+    def _make_http_adapter(self, responses):
+        """Adapter whose urllib3 pool replays `responses` in order."""
+        adapter = EtherscanChainAdapter()
+        self.addCleanup(adapter.close)
+        adapter._rl = mock.Mock()
+        adapter._max_retries = 3
+        adapter._http = mock.Mock()
+        adapter._http.request.side_effect = list(responses)
+        return adapter
+
+    def test_rate_limited_call_is_retried_after_retry_after(self) -> None:
+        ok = {"status": "1", "message": "OK", "result": "123"}
+        adapter = self._make_http_adapter([_Response(429, retry_after="2"), _Response(200, ok)])
+
+        with mock.patch.object(etherscan_module, "backoff_sleep") as sleep:
+            self.assertEqual(adapter.get_block_number_by_time(1000), 123)
+
+        sleep.assert_called_once_with(0, retry_after=2.0)
+        self.assertEqual(adapter._rl.acquire.call_count, 2)
+
+    def test_no_sleep_after_the_final_attempt(self) -> None:
+        adapter = self._make_http_adapter([_Response(500)] * 3)
+
+        with mock.patch.object(etherscan_module, "backoff_sleep") as sleep:
+            with self.assertRaises(DataSourceError):
+                adapter.get_block_number_by_time(1000)
+
+        self.assertEqual(adapter._http.request.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_iter_pages_stops_on_short_page_and_saves_checkpoint(self) -> None:
+        adapter = EtherscanChainAdapter()
+        self.addCleanup(adapter.close)
+        adapter._page_size = 2
+        pages = {1: [{"n": 1}, {"n": 2}], 2: [{"n": 3}]}
+        requested = []
+
+        def fake_call(params):
+            requested.append(params["page"])
+            return {"status": "1", "result": pages.get(params["page"], [])}
+
+        adapter._call = fake_call
+
+        got = list(adapter._iter_pages({"action": "txlist"}, "txlist:0xaaaa:1:2:"))
+
+        self.assertEqual(got, [pages[1], pages[2]])
+        self.assertEqual(sorted(requested), [1, 2])
+
+        reloaded = EtherscanChainAdapter()
+        self.addCleanup(reloaded.close)
+        self.assertEqual(reloaded._checkpoints, {"txlist:0xaaaa:1:2:": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
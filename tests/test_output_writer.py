@@ -0,0 +1,167 @@
+import gzip
+import json
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+from tracer.core.models import Edge, Graph, Node
+from tracer.io.output_writer import write_graph_json, write_summary_md
+from tracer.io.schemas import edge_to_dict, node_to_dict
+
+SEED = "0x5eed000000000000000000000000000000000001"
+A = "0xa000000000000000000000000000000000000001"
+B = "0xb000000000000000000000000000000000000002"
+C = "0xc000000000000000000000000000000000000003"
+D = "0xd000000000000000000000000000000000000004"
+TOKEN = "0x7000000000000000000000000000000000000007"
+
+# produced by the original sort/filter based write_summary_md
+EXPECTED_SUMMARY = """\
+# Trace Summary
+- Nodes: **5**
+- Edges: **8**
+- Seed: **0x5eed000000000000000000000000000000000001**
+
+## Top 10 Inflow Sources (by USD)
+
+- **250050.00 USD** | 0xa000000000000000000000000000000000000001
+- **10.00 USD** | 0x5eed000000000000000000000000000000000001
+
+## Top 10 Outflow Destinations (by USD)
+
+- **75.50 USD** | 0xc000000000000000000000000000000000000003
+- **75.50 USD** | 0xd000000000000000000000000000000000000004
+- **10.00 USD** | 0x5eed000000000000000000000000000000000001
+
+## Interpretation
+
+Flows are mixed without a strong directional skew, which often matches an active wallet used for routine transfers.
+
+## Limitations / Next steps
+
+- Only ETH + ERC-20 transfers are included.
+- No internal tx tracing, approvals, or NFT activity.
+- USD values are best-effort and may be missing for unknown tokens.
+- Large wallets may require tighter limits or better caching.
+
+## Top Transfers (by USD value)
+
+- **1000000.00 USD** | ETH ETH | 0xc0000000... -> 0xd0000000... | tx: 0x07
+- **250000.00 USD** | ETH ETH | 0xa0000000... -> 0x5eed0000... | tx: 0x01
+- **75.50 USD** | ETH ETH | 0x5eed0000... -> 0xc0000000... | tx: 0x03
+- **75.50 USD** | ETH ETH | 0x5eed0000... -> 0xd0000000... | tx: 0x04
+- **50.00 USD** | ERC20 TKN | 0xa0000000... -> 0x5eed0000... | tx: 0x06
+- **10.00 USD** | ETH ETH | 0x5eed0000... -> 0x5eed0000... | tx: 0x05
+- **0.00 USD** | ERC20 TKN | 0x5eed0000... -> 0xc0000000... | tx: 0x08
+- **unknown USD** | ERC20 TKN | 0xb0000000... -> 0x5eed0000... | tx: 0x02
+"""
+
+
+def _make_graph() -> Graph:
+    # covers ties, an unknown price, a self-transfer, sub-cent rounding and
+    # an edge that does not touch the seed
+    edges = [
+        Edge(A, SEED, "0x01", 900, "ETH", None, "ETH", Decimal("100"), Decimal("250000")),
+        Edge(B, SEED, "0x02", 901, "ERC20", TOKEN, "TKN", Decimal("5"), None),
+        Edge(SEED, C, "0x03", 902, "ETH", None, "ETH", Decimal("0.0302"), Decimal("75.5")),
+        Edge(SEED, D, "0x04", 903, "ETH", None, "ETH", Decimal("0.0302"), Decimal("75.5")),
+        Edge(SEED, SEED, "0x05", 904, "ETH", None, "ETH", Decimal("0.004"), Decimal("10")),
+        Edge(A, SEED, "0x06", 905, "ERC20", TOKEN, "TKN", Decimal("50"), Decimal("50")),
+        Edge(C, D, "0x07", 906, "ETH", None, "ETH", Decimal("400"), Decimal("999999.999")),
+        Edge(SEED, C, "0x08", 907, "ERC20", TOKEN, "TKN", Decimal("0.004"), Decimal("0.004")),
+    ]
+    nodes = {a: Node(a, is_contract=(a == C)) for a in (SEED, A, B, C, D)}
+    return Graph(nodes=nodes, edges=edges)
+
+
+class OutputWriterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out_dir = tmp.name
+
+    def _read_summary(self, graph: Graph, seed_address=None) -> str:
+        path = write_summary_md(graph, self.out_dir, seed_address=seed_address)
+        return Path(path).read_text(encoding="utf-8")
+
+    def test_summary_matches_reference_output(self) -> None:
+        # the seed is matched case-insensitively
+        text = self._read_summary(_make_graph(), seed_address="0x" + SEED[2:].upper())
+
+        self.assertEqual(text, EXPECTED_SUMMARY)
+
+    def test_summary_without_seed(self) -> None:
+        text = self._read_summary(_make_graph())
+
+        self.assertNotIn("- Seed:", text)
+        self.assertIn("_No inbound transfers found in the selected window._", text)
+        self.assertIn("No seed address was provided to the summary writer.", text)
+
+    def test_summary_top_transfers_keep_sort_order_for_ties(self) -> None:
+        edges = [
+            Edge(A, B, f"0x{i:02x}", i, "ETH", None, "ETH", Decimal(1), Decimal(i % 4) if i % 5 else None)
+            for i in range(40)
+        ]
+        graph = Graph(nodes={}, edges=edges)
+
+        text = self._read_summary(graph)
+
+        listed = [line.rsplit("tx: ", 1)[1] for line in text.splitlines() if "| tx: " in line]
+        reference = sorted(
+            edges,
+            key=lambda e: (e.usd_value is not None, e.usd_value or 0),
+            reverse=True,
+        )[:15]
+        self.assertEqual(listed, [e.tx_hash for e in reference])
+
+    def _expected_graph_doc(self, graph: Graph) -> dict:
+        return {
+            "nodes": [node_to_dict(n) for n in graph.nodes.values()],
+            "edges": [edge_to_dict(e) for e in graph.edges],
+        }
+
+    def test_streamed_graph_json_round_trips(self) -> None:
+        graph = _make_graph()
+
+        path = write_graph_json(graph, self.out_dir)
+
+        self.assertTrue(path.endswith("graph.json"))
+        with open(path, "rb") as f:
+            self.assertEqual(json.load(f), self._expected_graph_doc(graph))
+
+    def test_gzip_graph_json_round_trips(self) -> None:
+        graph = _make_graph()
+
+        path = write_graph_json(graph, self.out_dir, compress=True)
+
+        self.assertTrue(path.endswith("graph.json.gz"))
+        with gzip.open(path, "rb") as f:
+            self.assertEqual(json.load(f), self._expected_graph_doc(graph))
+
+    def test_graph_json_replaces_the_other_variant_of_an_earlier_run(self) -> None:
+        old = _make_graph()
+        new = Graph(nodes={SEED: Node(SEED, is_contract=False)}, edges=[])
+        out = Path(self.out_dir)
+
+        write_graph_json(old, self.out_dir)
+        write_graph_json(new, self.out_dir, compress=True)
+
+        # the viewer tries graph.json first: it must not find the old graph
+        self.assertEqual(sorted(f.name for f in out.iterdir()), ["graph.json.gz"])
+
+        write_graph_json(old, self.out_dir)
+
+        self.assertEqual(sorted(f.name for f in out.iterdir()), ["graph.json"])
+        with open(out / "graph.json", "rb") as f:
+            self.assertEqual(json.load(f), self._expected_graph_doc(old))
+
+    def test_empty_graph_json_is_valid(self) -> None:
+        path = write_graph_json(Graph(nodes={}, edges=[]), self.out_dir)
+
+        with open(path, "rb") as f:
+            self.assertEqual(json.load(f), {"nodes": [], "edges": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+import tracer.adapters.chain.rate_limiter as rate_limiter
+from tracer.adapters.chain.rate_limiter import (
+    RETRY_AFTER_MAX_SEC,
+    TokenBucket,
+    backoff_sleep,
+    parse_retry_after,
+)
+
+
+class _FrozenClock:
+    """Stands in for the time module: the clock never advances, sleeps are recorded."""
+
+    def __init__(self) -> None:
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_concurrent_callers_reserve_distinct_slots(self) -> None:
+        clock = _FrozenClock()
+        with mock.patch.object(rate_limiter, "time", clock):
+            bucket = TokenBucket(rate=10.0, capacity=2)
+            barrier = threading.Barrier(8)
+
+            def worker() -> None:
+                barrier.wait()
+                bucket.acquire()
+
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        # two tokens are free, every further caller waits one more interval
+        self.assertEqual(len(clock.sleeps), 6)
+        for waited, expected in zip(sorted(clock.sleeps), [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]):
+            self.assertAlmostEqual(waited, expected)
+
+    def test_rejects_invalid_parameters(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0.5)
+
+
+class ParseRetryAfterTests(unittest.TestCase):
+    def test_delta_seconds(self) -> None:
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertEqual(parse_retry_after("1.5"), 1.5)
+
+    def test_negative_delta_is_clamped(self) -> None:
+        self.assertEqual(parse_retry_after("-3"), 0.0)
+
+    def test_http_date(self) -> None:
+        future = datetime.now(timezone.utc) + timedelta(seconds=30)
+        waited = parse_retry_after(format_datetime(future, usegmt=True))
+        self.assertGreater(waited, 25)
+        self.assertLessEqual(waited, 30)
+
+        past = datetime.now(timezone.utc) - timedelta(seconds=30)
+        self.assertEqual(parse_retry_after(format_datetime(past, usegmt=True)), 0.0)
+
+    def test_missing_or_invalid_values(self) -> None:
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after(""))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class BackoffSleepTests(unittest.TestCase):
+    def test_retry_after_is_honoured_but_capped(self) -> None:
+        clock = _FrozenClock()
+        with mock.patch.object(rate_limiter, "time", clock):
+            backoff_sleep(0, retry_after=2.0)
+            backoff_sleep(0, retry_after=3600.0)
+
+        self.assertGreaterEqual(clock.sleeps[0], 2.0)
+        self.assertLess(clock.sleeps[0], 2.5)
+        self.assertGreaterEqual(clock.sleeps[1], RETRY_AFTER_MAX_SEC)
+        self.assertLess(clock.sleeps[1], RETRY_AFTER_MAX_SEC + 0.5)
+
+    def test_exponential_backoff_is_capped(self) -> None:
+        clock = _FrozenClock()
+        with mock.patch.object(rate_limiter, "time", clock):
+            backoff_sleep(10, base=0.5, cap=8.0)
+
+        self.assertLessEqual(clock.sleeps[0], 8.0 * 1.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import time
 import unittest
 from decimal import Decimal
 
@@ -20,6 +21,28 @@ class _StaticPrice(PricePort):
         return self._token_prices.get(token_address.lower())
 
 
+class _CountingChain(StaticChainAdapter):
+    """Records every address whose normal transactions are fetched."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.calls = []
+
+    def iter_normal_txs(self, address, start_block, end_block, sort="asc"):
+        self.calls.append(address)
+        return super().iter_normal_txs(address, start_block, end_block, sort=sort)
+
+
+class _ClockPrice(PricePort):
+    """ETH is worth exactly as many USD as the timestamp it is priced at."""
+
+    def get_eth_usd_price(self, timestamp: int) -> Decimal:
+        return Decimal(timestamp)
+
+    def get_token_usd_price(self, token_address: str, timestamp: int):
+        return Decimal(timestamp)
+
+
 class TracerServiceTests(unittest.TestCase):
     def _make_cfg(self, address: str, **overrides) -> TraceConfig:
         defaults = dict(
@@ -123,6 +146,164 @@ class TracerServiceTests(unittest.TestCase):
 
         self.assertEqual(len(graph.edges), 0)
 
+    def test_concurrent_fetch_matches_serial(self) -> None:
+        seed = "0xaaaa"
+        token = "0xtoken"
+        transfers = []
+        for i, (src, dst) in enumerate(
+            [(seed, "0xb1"), (seed, "0xb2"), (seed, "0xb3"), ("0xb1", "0xc1"), ("0xb2", "0xc2"), ("0xb3", "0xb1")]
+        ):
+            transfers.append(
+                RawErc20Transfer(
+                    tx_hash=f"0x{i}",
+                    block_number=10,
+                    timestamp=900 + i,
+                    from_address=src,
+                    to_address=dst,
+                    token_address=token,
+                    value_raw=100 * (i + 1),
+                    token_symbol="TKN",
+                    token_decimals=2,
+                )
+            )
+        chain = StaticChainAdapter(erc20_transfers=transfers, ts_to_block={1000: 10})
+        price = _StaticPrice(token_prices={token: Decimal("1")})
+        svc = TracerService(chain=chain, price=price)
+
+        serial = svc.trace(self._make_cfg(seed, hops=2))
+        concurrent = svc.trace(self._make_cfg(seed, hops=2, workers=4))
+
+        self.assertEqual(
+            [e.tx_hash for e in serial.edges],
+            [e.tx_hash for e in concurrent.edges],
+        )
+        self.assertEqual(list(serial.nodes), list(concurrent.nodes))
+
+    def test_price_within_an_hour_does_not_depend_on_trace_order(self) -> None:
+        txs = [
+            RawEthTransfer("0xlate", 10, 3700, "0xaaaa", "0xbbbb", 10**18),
+            RawEthTransfer("0xearly", 10, 3650, "0xcccc", "0xdddd", 10**18),
+        ]
+        chain = StaticChainAdapter(eth_transfers=txs, ts_to_block={4000: 10})
+        warm = TracerService(chain=chain, price=_ClockPrice())
+        warm.trace(self._make_cfg("0xaaaa", now_ts=4000))
+
+        after_warmup = warm.trace(self._make_cfg("0xcccc", now_ts=4000))
+        fresh = TracerService(chain=chain, price=_ClockPrice()).trace(self._make_cfg("0xcccc", now_ts=4000))
+
+        self.assertEqual(after_warmup.edges[0].usd_value, Decimal("3600"))
+        self.assertEqual(fresh.edges[0].usd_value, Decimal("3600"))
+
+    def test_no_progress_after_done_with_prefetch_in_flight(self) -> None:
+        seed = "0xaaaa"
+
+        class _SlowChain(StaticChainAdapter):
+            def iter_normal_txs(self, address, start_block, end_block, sort="asc"):
+                if address != seed:
+                    time.sleep(0.05)
+                return super().iter_normal_txs(address, start_block, end_block, sort=sort)
+
+        txs = [RawEthTransfer(f"0x{i}", 10, 900 + i, seed, f"0xb{i}", 10**18) for i in range(8)]
+        txs += [RawEthTransfer(f"0xc{i}", 10, 950 + i, f"0xb{i}", f"0xc{i}", 2 * 10**18) for i in range(8)]
+        chain = _SlowChain(eth_transfers=txs, ts_to_block={1000: 10})
+        svc = TracerService(chain=chain, price=_StaticPrice())
+        events = []
+
+        svc.trace(
+            self._make_cfg(seed, hops=2, max_total_edges=10, workers=4),
+            on_progress=lambda event, data: events.append(event),
+        )
+        time.sleep(0.2)
+
+        self.assertEqual(events[-1], "done")
+        self.assertEqual(events.count("done"), 1)
+
+    def test_address_reached_twice_is_fetched_once(self) -> None:
+        seed = "0xaaaa"
+        txs = [
+            RawEthTransfer("0x1", 10, 900, seed, "0xbbbb", 10**18),
+            RawEthTransfer("0x2", 10, 901, seed, "0xcccc", 10**18),
+            RawEthTransfer("0x3", 10, 902, "0xbbbb", "0xcccc", 10**18),
+        ]
+        chain = _CountingChain(eth_transfers=txs, ts_to_block={1000: 10})
+        svc = TracerService(chain=chain, price=_StaticPrice())
+
+        graph = svc.trace(self._make_cfg(seed, hops=2))
+
+        self.assertEqual(len(graph.edges), 3)
+        self.assertEqual(chain.calls.count("0xcccc"), 1)
+
+    def test_max_total_edges_stops_before_next_fetch(self) -> None:
+        seed = "0xaaaa"
+        txs = [
+            RawEthTransfer("0x1", 10, 900, seed, "0xbbbb", 10**18),
+            RawEthTransfer("0x2", 10, 901, "0xbbbb", "0xcccc", 10**18),
+        ]
+        chain = _CountingChain(eth_transfers=txs, ts_to_block={1000: 10})
+        svc = TracerService(chain=chain, price=_StaticPrice())
+
+        graph = svc.trace(self._make_cfg(seed, hops=2, max_total_edges=1))
+
+        self.assertEqual([e.tx_hash for e in graph.edges], ["0x1"])
+        self.assertEqual(chain.calls, [seed])
+
+    def test_max_total_edges_stops_prefetching_with_workers(self) -> None:
+        seed = "0xaaaa"
+        txs = [RawEthTransfer(f"0x{i}", 10, 900 + i, seed, f"0xb{i}", 10**18) for i in range(8)]
+        txs += [RawEthTransfer(f"0xc{i}", 10, 950 + i, f"0xb{i}", f"0xc{i}", 2 * 10**18) for i in range(8)]
+        chain = _CountingChain(eth_transfers=txs, ts_to_block={1000: 10})
+        svc = TracerService(chain=chain, price=_StaticPrice())
+
+        graph = svc.trace(self._make_cfg(seed, hops=2, max_total_edges=9, workers=4))
+
+        self.assertEqual(len(graph.edges), 9)
+        self.assertEqual(chain.calls, [seed, "0xb0"])
+
+    def test_min_usd_drops_small_transfers_but_keeps_unknown_prices(self) -> None:
+        seed = "0xaaaa"
+        eth_small = RawEthTransfer("0xsmall", 10, 900, seed, "0xbbbb", 10**15)
+        eth_big = RawEthTransfer("0xbig", 10, 901, seed, "0xcccc", 10**18)
+        unpriced = RawErc20Transfer(
+            tx_hash="0xunpriced",
+            block_number=10,
+            timestamp=902,
+            from_address=seed,
+            to_address="0xdddd",
+            token_address="0xtoken",
+            value_raw=1,
+            token_symbol="TKN",
+            token_decimals=0,
+        )
+        chain = StaticChainAdapter(
+            eth_transfers=[eth_small, eth_big],
+            erc20_transfers=[unpriced],
+            ts_to_block={1000: 10},
+        )
+        svc = TracerService(chain=chain, price=_StaticPrice())
+
+        graph = svc.trace(self._make_cfg(seed, min_usd=Decimal("100")))
+
+        self.assertEqual([e.tx_hash for e in graph.edges], ["0xbig", "0xunpriced"])
+
+    def test_contract_check_tags_nodes(self) -> None:
+        seed = "0xaaaa"
+        txs = [
+            RawEthTransfer("0x1", 10, 900, seed, "0xbbbb", 10**18),
+            RawEthTransfer("0x2", 10, 901, "0xbbbb", "0xcccc", 10**18),
+        ]
+        chain = StaticChainAdapter(
+            eth_transfers=txs,
+            contracts={"0xBBBB": True},
+            ts_to_block={1000: 10},
+        )
+        svc = TracerService(chain=chain, price=_StaticPrice())
+
+        graph = svc.trace(self._make_cfg(seed, hops=1, skip_contract_check=False))
+
+        self.assertTrue(graph.nodes["0xbbbb"].is_contract)
+        self.assertFalse(graph.nodes[seed].is_contract)
+        self.assertFalse(graph.nodes["0xcccc"].is_contract)
+
 
 if __name__ == "__main__":
     unittest.main()